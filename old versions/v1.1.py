@@ -148,7 +148,8 @@ class OBJECT_OT_generate_platonic(Operator):
         obj.scale = (props.scale, props.scale, props.scale)
         
         # Select the new object
-        bpy.ops.object.select_all(action='DESELECT')
+        for o in list(context.view_layer.objects.selected):
+            o.select_set(False)
         obj.select_set(True)
         context.view_layer.objects.active = obj
         
@@ -1,7 +1,9 @@
 # Improved Platonic Solids Generator with OOP principles
 
 import bpy
-import math
+import numpy as np
+from dataclasses import dataclass
+from bpy.app.handlers import persistent
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import EnumProperty, FloatVectorProperty, FloatProperty, BoolProperty, PointerProperty
 
@@ -17,114 +19,167 @@ bl_info = {
     "category": "Object",
 }
 
-# ==== Core Geometry Classes ====
-class PlatonicSolid:
-    def get_geometry(self):
-        raise NotImplementedError("Must be implemented in subclasses")
-
-class Tetrahedron(PlatonicSolid):
-    def get_geometry(self):
-        vertices = [
-            (1.633324, 0.943, -0.666),
-            (0.000204, -1.884353, -0.666),
-            (-1.631796, 0.942353, -0.666),
-            (0.0, 0.0, 2)
-        ]
-        faces = [
-            (0, 1, 2),
-            (0, 1, 3),
-            (0, 2, 3),
-            (1, 2, 3)
-        ]
-        return vertices, [], faces
-
-class Cube(PlatonicSolid):
-    def get_geometry(self):
-        vertices = [
-            (1.5, 1.5, 1.5),
-            (1.5, -1.5, 1.5),
-            (-1.5, -1.5, 1.5),
-            (-1.5, 1.5, 1.5),
-            (1.5, 1.5, -1.5),
-            (1.5, -1.5, -1.5),
-            (-1.5, -1.5, -1.5),
-            (-1.5, 1.5, -1.5)
-        ]
-        faces = [
-            (0, 1, 2, 3),
-            (4, 5, 6, 7),
-            (0, 4, 5, 1),
-            (1, 5, 6, 2),
-            (2, 6, 7, 3),
-            (3, 7, 4, 0)
-        ]
-        return vertices, [], faces
-
-class Octahedron(PlatonicSolid):
-    def get_geometry(self):
-        v = [
-            (0.0, 0.0, -1.5),
-            (-1.5, 0.0, 0.0),
-            (0.0, -1.5, 0.0),
-            (1.5, 0.0, 0.0),
-            (0.0, 1.5, 0.0),
-            (0.0, 0.0, 1.5)
-        ]
-        f = [
-            (0, 1, 2),
-            (0, 2, 3),
-            (0, 3, 4),
-            (0, 4, 1),
-            (5, 1, 2),
-            (5, 2, 3),
-            (5, 3, 4),
-            (5, 4, 1)
-        ]
-        return v, [], f
-
-class Dodecahedron(PlatonicSolid):
-    def get_geometry(self):
-        vertices = [(1, 1, 1), (1, -1, 1), (-1, -1, 1), (-1, 1, 1), 
-                (1, 1, -1), (1, -1, -1), (-1, -1, -1), (-1, 1, -1),
-                (0, 1.618, 0.618), (0, -1.618, 0.618), 
-                (0, -1.618, -0.618), (0, 1.618, -0.618),
-                (0.618, 0, 1.618), (-0.618, 0, 1.618), 
-                (-0.618, 0, -1.618), (0.618, 0, -1.618),
-                (1.618, 0.618, 0), (-1.618, 0.618, 0), 
-                (-1.618, -0.618, 0), (1.618, -0.618, 0)]
-        faces = [(8, 11, 4, 16, 0), (8, 11, 7, 17, 3), (9, 10, 5, 19, 1), 
-                (9, 10, 6, 18, 2), (12, 13, 3, 8, 0), (12, 13, 2, 9, 1), 
-                (15, 14, 7, 11, 4), (15, 14, 6, 10, 5), (16, 19, 1, 12, 0), 
-                (16, 19, 5, 15, 4), (17, 18, 2, 13, 3), (17, 18, 6, 14, 7)]
-        return vertices, [], faces
-
-class Icosahedron(PlatonicSolid):
-    def get_geometry(self):
-        vertices = [
-                (0, 1, 1.618), (0, -1, 1.618), (0, 1, -1.618), (0, -1, -1.618),
-                (1.618, 0, 1), (1.618, 0, -1), (-1.618, 0, 1), (-1.618, 0, -1),
-                (1, 1.618, 0), (-1, 1.618, 0), (1, -1.618, 0), (-1, -1.618, 0)
-            ]
-        faces = [(0, 1, 4), (0, 1, 6), (2, 3, 5), (2, 3, 7),
-                (4, 5, 8), (4, 5, 10), (6, 7, 9), (6, 7, 11),
-                (8, 9, 0), (8, 9, 2), (10, 11, 1), (10, 11, 3),
-                (0, 4, 8), (1, 4, 10), (1, 6, 11), (0, 6, 9),
-                (2, 5, 8), (3, 5, 10), (3, 7, 11), (2, 7, 9)]
-        return vertices, [], faces
-
-solid_classes = {
-    'TETRAHEDRON': Tetrahedron,
-    'CUBE': Cube,
-    'OCTAHEDRON': Octahedron,
-    'DODECAHEDRON': Dodecahedron,
-    'ICOSAHEDRON': Icosahedron
+# ==== Geometry Data ====
+# Built once at import and shared by every generate call.
+_TETRA_V = (
+    (1.633324, 0.943, -0.666),
+    (0.000204, -1.884353, -0.666),
+    (-1.631796, 0.942353, -0.666),
+    (0.0, 0.0, 2)
+)
+_TETRA_F = (
+    (0, 1, 2),
+    (0, 1, 3),
+    (0, 2, 3),
+    (1, 2, 3)
+)
+
+_CUBE_V = (
+    (1.5, 1.5, 1.5),
+    (1.5, -1.5, 1.5),
+    (-1.5, -1.5, 1.5),
+    (-1.5, 1.5, 1.5),
+    (1.5, 1.5, -1.5),
+    (1.5, -1.5, -1.5),
+    (-1.5, -1.5, -1.5),
+    (-1.5, 1.5, -1.5)
+)
+_CUBE_F = (
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 4, 5, 1),
+    (1, 5, 6, 2),
+    (2, 6, 7, 3),
+    (3, 7, 4, 0)
+)
+
+_OCTA_V = (
+    (0.0, 0.0, -1.5),
+    (-1.5, 0.0, 0.0),
+    (0.0, -1.5, 0.0),
+    (1.5, 0.0, 0.0),
+    (0.0, 1.5, 0.0),
+    (0.0, 0.0, 1.5)
+)
+_OCTA_F = (
+    (0, 1, 2),
+    (0, 2, 3),
+    (0, 3, 4),
+    (0, 4, 1),
+    (5, 1, 2),
+    (5, 2, 3),
+    (5, 3, 4),
+    (5, 4, 1)
+)
+
+def _golden_vertices():
+    # Вершини додекаедра та ікосаедра генеруються знаковими шаблонами (φ — золотий перетин);
+    # порядок рядків збігається з індексами граней нижче
+    # float32-скаляр: інакше numpy 2 підвищить добутки до float64
+    phi = np.float32((1 + np.sqrt(5)) / 2)
+    ring = np.array(((1, 1), (-1, 1), (-1, -1), (1, -1)), dtype=np.float32)
+    quad = np.array(((1, 1), (-1, 1), (1, -1), (-1, -1)), dtype=np.float32)
+    zero = np.zeros(4, dtype=np.float32)
+    one = np.ones(4, dtype=np.float32)
+
+    dodeca = np.concatenate((
+        np.column_stack((ring[:, 1], ring[:, 0], one)),                  # (±1, ±1, 1)
+        np.column_stack((ring[:, 1], ring[:, 0], -one)),                 # (±1, ±1, -1)
+        np.column_stack((zero, ring[:, 0] * phi, ring[:, 1] / phi)),     # (0, ±φ, ±1/φ)
+        np.column_stack((ring[:, 0] / phi, zero, ring[:, 1] * phi)),     # (±1/φ, 0, ±φ)
+        np.column_stack((ring[:, 0] * phi, ring[:, 1] / phi, zero)),     # (±φ, ±1/φ, 0)
+    ))
+    icosa = np.concatenate((
+        np.column_stack((zero, quad[:, 0], quad[:, 1] * phi)),           # (0, ±1, ±φ)
+        np.column_stack((quad[:, 1] * phi, zero, quad[:, 0])),           # (±φ, 0, ±1)
+        np.column_stack((quad[:, 0], quad[:, 1] * phi, zero)),           # (±1, ±φ, 0)
+    ))
+    # Суцільні float32-масиви (N, 3): _build_buffers приймає їх без перепакування
+    return dodeca, icosa
+
+_DODECA_V, _ICOSA_V = _golden_vertices()
+_DODECA_F = ((8, 11, 4, 16, 0), (8, 11, 7, 17, 3), (9, 10, 5, 19, 1),
+             (9, 10, 6, 18, 2), (12, 13, 3, 8, 0), (12, 13, 2, 9, 1),
+             (15, 14, 7, 11, 4), (15, 14, 6, 10, 5), (16, 19, 1, 12, 0),
+             (16, 19, 5, 15, 4), (17, 18, 2, 13, 3), (17, 18, 6, 14, 7))
+
+_ICOSA_F = ((0, 1, 4), (0, 1, 6), (2, 3, 5), (2, 3, 7),
+            (4, 5, 8), (4, 5, 10), (6, 7, 9), (6, 7, 11),
+            (8, 9, 0), (8, 9, 2), (10, 11, 1), (10, 11, 3),
+            (0, 4, 8), (1, 4, 10), (1, 6, 11), (0, 6, 9),
+            (2, 5, 8), (3, 5, 10), (3, 7, 11), (2, 7, 9))
+
+SOLID_GEOMETRY = {
+    'TETRAHEDRON': (_TETRA_V, _TETRA_F),
+    'CUBE': (_CUBE_V, _CUBE_F),
+    'OCTAHEDRON': (_OCTA_V, _OCTA_F),
+    'DODECAHEDRON': (_DODECA_V, _DODECA_F),
+    'ICOSAHEDRON': (_ICOSA_V, _ICOSA_F)
 }
 
+# Статичний список для EnumProperty (без comprehension у самому оголошенні властивості)
+_SHAPE_ITEMS = tuple((k, k.title(), '') for k in SOLID_GEOMETRY)
+
+# ==== Mesh Buffers ====
+# Пласкі масиви для foreach_set, підготовлені один раз під час імпорту
+@dataclass(frozen=True)
+class GeomBuffers:
+    # Явні __slots__ замість slots=True, що з'явився лише в Python 3.10 (Blender 3.1+)
+    __slots__ = ('coords', 'loop_start', 'loop_total', 'loop_verts', 'loop_edges', 'edges')
+
+    coords: np.ndarray
+    loop_start: np.ndarray
+    loop_total: np.ndarray
+    loop_verts: np.ndarray
+    loop_edges: np.ndarray
+    edges: np.ndarray
+
+def _build_buffers(vertices, faces):
+    coords = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1)
+    loop_total = np.array([len(f) for f in faces], dtype=np.int32)
+    loop_start = np.zeros(len(faces), dtype=np.int32)
+    np.cumsum(loop_total[:-1], dtype=np.int32, out=loop_start[1:])
+    loop_verts = np.fromiter((i for f in faces for i in f), dtype=np.int32, count=int(loop_total.sum()))
+
+    # Ребра тіл незмінні, тому виводимо їх тут, а не через mesh.update(calc_edges=True)
+    loop_pairs = [tuple(sorted((f[i], f[(i + 1) % len(f)]))) for f in faces for i in range(len(f))]
+    edge_list = sorted(set(loop_pairs))
+    edge_index = {e: i for i, e in enumerate(edge_list)}
+    loop_edges = np.fromiter((edge_index[e] for e in loop_pairs), dtype=np.int32, count=len(loop_pairs))
+    edges = np.array(edge_list, dtype=np.int32).reshape(-1)
+    return GeomBuffers(coords, loop_start, loop_total, loop_verts, loop_edges, edges)
+
+_GEOM_BUF = {shape: _build_buffers(v, f) for shape, (v, f) in SOLID_GEOMETRY.items()}
+
+def _merge_buffers(placed):
+    # Зливає кілька тіл ((буфер, масштаб, позиція), ...) в один буфер зі зсунутими індексами
+    coords, loop_total, loop_verts, loop_edges, edges = [], [], [], [], []
+    vert_offset = edge_offset = 0
+    for buf, scale, location in placed:
+        coords.append((buf.coords.reshape(-1, 3) * scale + np.asarray(location, dtype=np.float32)).reshape(-1))
+        loop_total.append(buf.loop_total)
+        loop_verts.append(buf.loop_verts + vert_offset)
+        loop_edges.append(buf.loop_edges + edge_offset)
+        edges.append(buf.edges + vert_offset)
+        vert_offset += len(buf.coords) // 3
+        edge_offset += len(buf.edges) // 2
+
+    loop_total = np.concatenate(loop_total)
+    loop_start = np.zeros(len(loop_total), dtype=np.int32)
+    np.cumsum(loop_total[:-1], dtype=np.int32, out=loop_start[1:])
+    return GeomBuffers(np.concatenate(coords), loop_start, loop_total,
+                       np.concatenate(loop_verts), np.concatenate(loop_edges), np.concatenate(edges))
+
+# (форма, масштаб) -> ім'я вже побудованої сітки; сітки незмінні, тож їх ділять усі об'єкти з цими параметрами
+_MESH_CACHE = {}
+# Колір (округлений) -> ім'я матеріалу; однаково забарвлені тіла ділять один матеріал
+_MAT_CACHE = {}
+
 # ==== Properties ====
 class PlatonicSolidProperties(PropertyGroup):
     shape_type: EnumProperty(
         name="Shape",
-        items=[(k, k.title(), '') for k in solid_classes.keys()],
+        items=_SHAPE_ITEMS,
         default='TETRAHEDRON'
     )
     color: FloatVectorProperty(
@@ -157,38 +212,113 @@ class PlatonicSolidProperties(PropertyGroup):
 # ==== Builder Utilities ====
 class SolidBuilder:
     @staticmethod
-    def create_mesh(name, vertices, edges, faces):
+    def create_mesh(name, buf, scale=1.0):
+        # foreach_set копіює цілі буфери в C замість поелементного циклу from_pydata;
+        # масштаб вбудовується в координати, тож об'єкт лишається з одиничним scale
         mesh = bpy.data.meshes.new(name)
-        mesh.from_pydata(vertices, edges, faces)
-        mesh.update()
+        mesh.vertices.add(len(buf.coords) // 3)
+        mesh.vertices.foreach_set('co', buf.coords * scale if scale != 1.0 else buf.coords)
+        mesh.edges.add(len(buf.edges) // 2)
+        mesh.edges.foreach_set('vertices', buf.edges)
+        mesh.loops.add(len(buf.loop_verts))
+        mesh.loops.foreach_set('vertex_index', buf.loop_verts)
+        mesh.loops.foreach_set('edge_index', buf.loop_edges)
+        mesh.polygons.add(len(buf.loop_total))
+        mesh.polygons.foreach_set('loop_start', buf.loop_start)
+        # З Blender 4.0 розмір грані виводиться зі зсувів loop_start, а loop_total лише для читання
+        if bpy.app.version < (4, 0, 0):
+            mesh.polygons.foreach_set('loop_total', buf.loop_total)
+        mesh.update(calc_edges=False)
+        if bpy.app.debug:
+            mesh.validate(verbose=True)
+        return mesh
+
+    @staticmethod
+    def mesh_matches(mesh, buf, scale):
+        if len(mesh.vertices) * 3 != buf.coords.size or len(mesh.polygons) != buf.loop_total.size:
+            return False
+        coords = np.empty(buf.coords.size, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        return np.allclose(coords, buf.coords * scale, atol=1e-5)
+
+    @staticmethod
+    def get_mesh(shape, scale):
+        # Ключем кешу є ім'я: посилання на ID стають недійсними після undo чи видалення
+        # Округлюємо один раз: і ключ, і сітка мають відповідати тому самому масштабу
+        scale = round(scale, 4)
+        key = (shape, scale)
+        stamp = f"{shape}:{scale}"
+        buf = _GEOM_BUF[shape]
+        mesh = bpy.data.meshes.get(_MESH_CACHE.get(key, ""))
+        # Ім'я могла зайняти інша сітка (після undo), а саму сітку — змінити в Edit Mode;
+        # в обох випадках це вже не потрібне тіло, тож будуємо нову
+        if (mesh is not None and mesh.get("platonic_key") == stamp
+                and SolidBuilder.mesh_matches(mesh, buf, scale)):
+            # Слот спільний для всіх об'єктів цієї сітки, тож його могли видалити на будь-якому з них
+            if not mesh.materials:
+                mesh.materials.append(None)
+            return mesh
+
+        if not buf.coords.size or not buf.loop_total.size:
+            raise ValueError(f"Геометрія '{shape}' порожня або некоректна.")
+
+        mesh = SolidBuilder.create_mesh(f"Platonic_{shape.title()}_{scale:g}", buf, scale)
+        mesh["platonic_key"] = stamp
+        # Порожній слот: матеріал призначається кожному об'єкту окремо
+        mesh.materials.append(None)
+        _MESH_CACHE[key] = mesh.name
         return mesh
 
     @staticmethod
-    def create_material(name, color):
-        mat = bpy.data.materials.get(name) or bpy.data.materials.new(name=name)
+    def create_material(color):
+        key = tuple(round(c, 4) for c in color)
+        name = f"Platonic_{key}"
+        # Після перезавантаження файлу кеш порожній, але матеріал з логічним ім'ям міг зберегтися
+        mat = bpy.data.materials.get(_MAT_CACHE.get(key, "")) or bpy.data.materials.get(name)
+        # Матеріал могли перефарбувати вручну — тоді він більше не відповідає ключу
+        if mat is not None and mat.get("platonic") and tuple(round(c, 4) for c in mat.diffuse_color) == key:
+            _MAT_CACHE[key] = mat.name
+            return mat
+
+        mat = bpy.data.materials.new(name=name)
         mat.diffuse_color = color
+        # Позначка спільного матеріалу аддона (зберігається у .blend разом з матеріалом)
+        mat["platonic"] = True
+        _MAT_CACHE[key] = mat.name
         return mat
 
     @staticmethod
-    def add_object(name, solid, color, scale, location):
+    def remove_objects(scene, objects):
+        # Пряме видалення даних без накладних витрат bpy.ops (poll, undo push, перемальовування)
+        scene_collections = None
+        for obj in list(objects):
+            if len(obj.users_scene) <= 1:
+                bpy.data.objects.remove(obj, do_unlink=True)
+                continue
+
+            # Об'єкт є і в інших сценах — лише від'єднуємо його від цієї, як delete(use_global=False)
+            if scene_collections is None:
+                scene_collections = [scene.collection]
+                for coll in scene_collections:
+                    scene_collections.extend(coll.children)
+            for coll in obj.users_collection:
+                if coll in scene_collections:
+                    coll.objects.unlink(obj)
+
+    @staticmethod
+    def add_object(name, shape, color, scale, location):
+        obj = None
         try:
-            # Спроба отримати геометрію
-            vertices, edges, faces = solid.get_geometry()
-            if not vertices or not faces:
-                raise ValueError(f"Геометрія '{name}' порожня або некоректна.")
-            
-            # Створення сітки
-            mesh = SolidBuilder.create_mesh(name, vertices, edges, faces)
+            # Отримання спільної сітки
+            mesh = SolidBuilder.get_mesh(shape, scale)
             obj = bpy.data.objects.new(name, mesh)
             obj.location = location
-            obj.scale = (scale,) * 3
 
-            # Додавання матеріалу
-            mat = SolidBuilder.create_material(f"{name}_Material", color)
-            if obj.data.materials:
-                obj.data.materials[0] = mat
-            else:
-                obj.data.materials.append(mat)
+            # Додавання матеріалу (на рівні об'єкта, бо сітка спільна)
+            mat = SolidBuilder.create_material(color)
+            slot = obj.material_slots[0]
+            slot.link = 'OBJECT'
+            slot.material = mat
 
             # Додавання об'єкта до сцени
             bpy.context.collection.objects.link(obj)
@@ -197,6 +327,9 @@ class SolidBuilder:
 
         except Exception as e:
             print(f"[Помилка при створенні '{name}']: {e}")
+            # Напівстворений об'єкт ще не прив'язаний до сцени — прибираємо, щоб не лишався сиротою
+            if obj is not None:
+                bpy.data.objects.remove(obj, do_unlink=True)
             return None
 
 # ==== Operators ====
@@ -209,13 +342,11 @@ class OBJECT_OT_generate_platonic(Operator):
         props = context.scene.platonic_props
 
         if props.clear_before_create:
-            bpy.ops.object.select_all(action='SELECT')
-            bpy.ops.object.delete(use_global=False)
+            SolidBuilder.remove_objects(context.scene, context.selectable_objects)
 
-        solid_class = solid_classes.get(props.shape_type, Tetrahedron)
-        solid = solid_class()
+        shape = props.shape_type if props.shape_type in SOLID_GEOMETRY else 'TETRAHEDRON'
 
-        SolidBuilder.add_object(props.shape_type, solid, props.color, props.scale, (0, 0, 0))
+        SolidBuilder.add_object(shape, shape, props.color, props.scale, (0, 0, 0))
         return {'FINISHED'}
 
 class OBJECT_OT_move_selected(Operator):
@@ -245,12 +376,32 @@ class OBJECT_OT_change_color(Operator):
 
     def execute(self, context):
         props = context.scene.platonic_props
+        shared = None
+        recolored = set()
+
         for obj in context.selected_objects:
-            if obj.type == 'MESH':
-                mat = obj.data.materials[0] if obj.data.materials else bpy.data.materials.new(name="Updated_Material")
-                mat.diffuse_color = props.color
-                if not obj.data.materials:
-                    obj.data.materials.append(mat)
+            if obj.type != 'MESH':
+                continue
+            current = obj.active_material
+            if current is not None and not current.get("platonic"):
+                # Власний матеріал користувача перефарбовуємо на місці, один раз на матеріал
+                if current.name not in recolored:
+                    recolored.add(current.name)
+                    current.diffuse_color = props.color
+                continue
+
+            # Спільний матеріал не перефарбовуємо (ним користуються й невиділені тіла), а замінюємо
+            if shared is None:
+                shared = SolidBuilder.create_material(props.color)
+            # Кожне призначення позначає об'єкт для depsgraph, тож пропускаємо ті, що вже мають цей матеріал
+            if current == shared:
+                continue
+            if not obj.material_slots:
+                obj.data.materials.append(None)
+            # Слот на рівні об'єкта, щоб не змінити інші об'єкти зі спільною сіткою
+            slot = obj.material_slots[obj.active_material_index]
+            slot.link = 'OBJECT'
+            slot.material = shared
         return {'FINISHED'}
 
 class OBJECT_OT_delete_selected(Operator):
@@ -259,7 +410,7 @@ class OBJECT_OT_delete_selected(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        bpy.ops.object.delete(use_global=False, confirm=False)
+        SolidBuilder.remove_objects(context.scene, context.selected_objects)
         return {'FINISHED'}
 
 class OBJECT_OT_generate_template1(Operator):
@@ -269,20 +420,24 @@ class OBJECT_OT_generate_template1(Operator):
     def execute(self, context):
         props = context.scene.platonic_props
         if props.clear_before_create:
-            bpy.ops.object.select_all(action='SELECT')
-            bpy.ops.object.delete(use_global=False)
+            SolidBuilder.remove_objects(context.scene, context.selectable_objects)
 
         template_data = [
-            ("Tetrahedron", Tetrahedron(), (0, 0, 0), props.color),
-            ("Cube", Cube(), (4, 0, 0), props.color),
-            ("Octahedron", Octahedron(), (-4, 0, 0), props.color),
-            ("Dodecahedron", Dodecahedron(), (8, 0, 0), props.color),
-            ("Icosahedron", Icosahedron(), (-8, 0, 0), props.color)
+            ('TETRAHEDRON', (0, 0, 0)),
+            ('CUBE', (4, 0, 0)),
+            ('OCTAHEDRON', (-4, 0, 0)),
+            ('DODECAHEDRON', (8, 0, 0)),
+            ('ICOSAHEDRON', (-8, 0, 0))
         ]
 
-        for name, solid, location, color in template_data:
-            SolidBuilder.add_object(name, solid, color, props.scale, location)
+        # Усі тіла в одній сітці: один об'єкт, один матеріал, одне оновлення depsgraph
+        buf = _merge_buffers([(_GEOM_BUF[shape], props.scale, location) for shape, location in template_data])
+        mesh = SolidBuilder.create_mesh("Template1", buf)
+        mesh.materials.append(SolidBuilder.create_material(props.color))
 
+        obj = bpy.data.objects.new("Template1", mesh)
+        context.collection.objects.link(obj)
+        obj.select_set(True)
         return {'FINISHED'}
 
 class OBJECT_OT_generate_template2(Operator):
@@ -292,8 +447,7 @@ class OBJECT_OT_generate_template2(Operator):
     def execute(self, context):
         props = context.scene.platonic_props
         if props.clear_before_create:
-            bpy.ops.object.select_all(action='SELECT')
-            bpy.ops.object.delete(use_global=False)
+            SolidBuilder.remove_objects(context.scene, context.selectable_objects)
 
         color_map = {
             "Tetrahedron": (1.0, 0.0, 0.0, 1.0),
@@ -304,15 +458,15 @@ class OBJECT_OT_generate_template2(Operator):
         }
 
         template_data = [
-            ("Tetrahedron", Tetrahedron(), (0, 0, 0)),
-            ("Cube", Cube(), (4, 0, 0)),
-            ("Octahedron", Octahedron(), (-4, 0, 0)),
-            ("Dodecahedron", Dodecahedron(), (8, 0, 0)),
-            ("Icosahedron", Icosahedron(), (-8, 0, 0))
+            ("Tetrahedron", 'TETRAHEDRON', (0, 0, 0)),
+            ("Cube", 'CUBE', (4, 0, 0)),
+            ("Octahedron", 'OCTAHEDRON', (-4, 0, 0)),
+            ("Dodecahedron", 'DODECAHEDRON', (8, 0, 0)),
+            ("Icosahedron", 'ICOSAHEDRON', (-8, 0, 0))
         ]
 
-        for name, solid, location in template_data:
-            SolidBuilder.add_object(name, solid, color_map[name], props.scale, location)
+        for name, shape, location in template_data:
+            SolidBuilder.add_object(name, shape, color_map[name], props.scale, location)
 
         return {'FINISHED'}
 
@@ -343,74 +497,89 @@ class VIEW3D_PT_platonic_solids(Panel):
     bl_category = 'Platonic Solids'
     bl_label = 'Platonic Solids Generator'
 
-    def draw(self, context):
-        layout = self.layout
-        props = context.scene.platonic_props
-
+    # (заголовок, ((властивість, kwargs, підпис рядка), ...), ((оператор, kwargs), ...)) —
+    # будується один раз, draw лише проходить таблицею. Якщо підпис рядка не None,
+    # властивість малюється в окремому row() під цим підписом
+    _LAYOUT = (
         # === Widget 1: Creation ===
-        box = layout.box()
-        box.label(text="1. Створення")
-        box.prop(props, "shape_type")
-        box.prop(props, "scale")
-        box.prop(props, "clear_before_create")
-        box.operator("object.generate_platonic")
-
+        ("1. Створення",
+         (("shape_type", {}, None), ("scale", {}, None), ("clear_before_create", {}, None)),
+         (("object.generate_platonic", {}),)),
         # === Widget 2: Selection ===
-        box = layout.box()
-        box.label(text="2. Виділення")
-        box.operator("object.delete_selected", icon='TRASH')
-
+        ("2. Виділення",
+         (),
+         (("object.delete_selected", {"icon": 'TRASH'}),)),
         # === Widget 3: Position Control ===
-        box = layout.box()
-        box.label(text="3. Position Control")
-        
-        # Move selected objects by offset
-        box.label(text="Move Selected:")
-        row = box.row()
-        row.prop(props, "move_offset", text="")
-        box.operator("object.move_selected", icon='ARROW_LEFTRIGHT')
-
+        ("3. Position Control",
+         (("move_offset", {"text": ""}, "Move Selected:"),),
+         (("object.move_selected", {"icon": 'ARROW_LEFTRIGHT'}),)),
         # === Widget 4: Editing ===
-        box = layout.box()
-        box.label(text="4. Редагування")
-        box.prop(props, "color", text="Колір")
-        box.operator("object.change_color")
-
+        ("4. Редагування",
+         (("color", {"text": "Колір"}, None),),
+         (("object.change_color", {}),)),
         # === Widget 5: Templates ===
-        box = layout.box()
-        box.label(text="Шаблони")
-        box.operator("object.generate_template1", icon='MOD_ARRAY')
-        box.operator("object.generate_template2", icon='COLOR')
-
+        ("Шаблони",
+         (),
+         (("object.generate_template1", {"icon": 'MOD_ARRAY'}),
+          ("object.generate_template2", {"icon": 'COLOR'}))),
         # === Widget 6: Animation ===
-        box = layout.box()
-        box.label(text="Анімації")
-        box.operator("object.add_rotation_animation", icon='DRIVER_ROTATIONAL_DIFFERENCE')
+        ("Анімації",
+         (),
+         (("object.add_rotation_animation", {"icon": 'DRIVER_ROTATIONAL_DIFFERENCE'}),)),
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.platonic_props
+
+        for title, prop_items, op_items in self._LAYOUT:
+            box = layout.box()
+            box.label(text=title)
+            for name, kwargs, row_caption in prop_items:
+                if row_caption is None:
+                    box.prop(props, name, **kwargs)
+                else:
+                    box.label(text=row_caption)
+                    box.row().prop(props, name, **kwargs)
+            for idname, kwargs in op_items:
+                box.operator(idname, **kwargs)
 
 # ==== Registration ====
+classes = (
+    PlatonicSolidProperties,
+    OBJECT_OT_generate_platonic,
+    OBJECT_OT_move_selected,
+    OBJECT_OT_change_color,
+    OBJECT_OT_delete_selected,
+    OBJECT_OT_generate_template1,
+    OBJECT_OT_generate_template2,
+    OBJECT_OT_add_rotation_animation,
+    VIEW3D_PT_platonic_solids,
+)
+
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+# Кеші зберігають імена datablock-ів поточного файлу, тож при відкритті іншого їх скидаємо
+@persistent
+def _clear_caches(*_args):
+    _MESH_CACHE.clear()
+    _MAT_CACHE.clear()
+
+# Оператори реєструються одразу: draw() панелі виконується в режимі лише для читання,
+# де bpy.utils.register_class недоступний, а кнопкам панелі оператори потрібні з першого малювання
 def register():
-    bpy.utils.register_class(PlatonicSolidProperties)
+    _clear_caches()
+    _register_classes()
     bpy.types.Scene.platonic_props = PointerProperty(type=PlatonicSolidProperties)
-    bpy.utils.register_class(OBJECT_OT_generate_platonic)
-    bpy.utils.register_class(OBJECT_OT_move_selected)
-    bpy.utils.register_class(OBJECT_OT_change_color)
-    bpy.utils.register_class(OBJECT_OT_delete_selected)
-    bpy.utils.register_class(OBJECT_OT_generate_template1)
-    bpy.utils.register_class(OBJECT_OT_generate_template2)
-    bpy.utils.register_class(OBJECT_OT_add_rotation_animation)
-    bpy.utils.register_class(VIEW3D_PT_platonic_solids)
+    if _clear_caches not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_clear_caches)
 
 def unregister():
-    bpy.utils.unregister_class(VIEW3D_PT_platonic_solids)
-    bpy.utils.unregister_class(OBJECT_OT_add_rotation_animation)
-    bpy.utils.unregister_class(OBJECT_OT_generate_template2)
-    bpy.utils.unregister_class(OBJECT_OT_generate_template1)
-    bpy.utils.unregister_class(OBJECT_OT_delete_selected)
-    bpy.utils.unregister_class(OBJECT_OT_change_color)
-    bpy.utils.unregister_class(OBJECT_OT_move_selected)
-    bpy.utils.unregister_class(OBJECT_OT_generate_platonic)
+    if _clear_caches in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_clear_caches)
     del bpy.types.Scene.platonic_props
-    bpy.utils.unregister_class(PlatonicSolidProperties)
+    _unregister_classes()
+    _clear_caches()
 
 if __name__ == "__main__":
     register()